@@ -5,4 +5,18 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'doctors_app.settings')
 
 app = Celery('doctors_app')
 app.config_from_object('django.conf:settings', namespace='CELERY')
-app.autodiscover_tasks() 
\ No newline at end of file
+app.autodiscover_tasks()
+
+
+# If you run Celery Beat separately in production, keep schedules; otherwise you can comment this out.
+@app.on_after_configure.connect
+def setup_beat_schedule(sender, **kwargs):
+    # Imported here so web workers that never load Celery's config skip celery.schedules
+    from celery.schedules import crontab
+
+    sender.conf.beat_schedule = {
+        "send-appointment-reminders-every-1-minute": {
+            "task": "Hospitals.tasks.send_appointment_reminders",
+            "schedule": crontab(minute="*"),  # every 1 minute
+        },
+    }
@@ -5,44 +5,66 @@ Production-friendly for Render with Channels (Daphne), WhiteNoise, and env-drive
 
 from pathlib import Path
 import os
+import re
 import dj_database_url
 
+# Snapshot every env var the settings use in one pass; the rest of the file does
+# plain dict lookups. Unset vars are None, so only they fall back to a default
+# (an empty SECRET_KEY still fails loudly, EMAIL_USE_TLS="" still means off).
+_env_keys = (
+    "SECRET_KEY", "DEBUG", "RENDER_EXTERNAL_HOSTNAME", "DJANGO_ALLOWED_HOSTS",
+    "CSRF_TRUSTED_ORIGINS", "HAS_STATIC_DIR", "EMAIL_HOST", "EMAIL_USE_TLS",
+    "EMAIL_PORT", "EMAIL_HOST_USER", "EMAIL_HOST_PASSWORD", "REDIS_URL",
+)
+_env = {k: os.environ.get(k) for k in _env_keys}
+
+
+def _get(key, default=None):
+    value = _env[key]
+    return default if value is None else value
+
+
 # -------------------------------------------------------------------
 # Base paths
 # -------------------------------------------------------------------
 BASE_DIR = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = BASE_DIR / "templates"
+_STATIC_SRC = BASE_DIR / "static"  # source assets, committed to the repo
 
 # -------------------------------------------------------------------
 # Security & Debug (read from environment)
 # -------------------------------------------------------------------
-SECRET_KEY = os.environ.get("SECRET_KEY", "dev-secret-change-me")
-DEBUG = os.environ.get("DEBUG", "False") == "True"
-
-ALLOWED_HOSTS = ["localhost", "127.0.0.1"]
+SECRET_KEY = _get("SECRET_KEY", "dev-secret-change-me")
+DEBUG = _get("DEBUG", "False") == "True"
 
 # Render injects this automatically; allow it if present
-RENDER_EXTERNAL_HOSTNAME = os.environ.get("RENDER_EXTERNAL_HOSTNAME")
-if RENDER_EXTERNAL_HOSTNAME:
-    ALLOWED_HOSTS.append(RENDER_EXTERNAL_HOSTNAME)
-
-# Optional manual allowlist (comma-separated), e.g. DJANGO_ALLOWED_HOSTS="example.com,api.example.com"
-EXTRA_ALLOWED = os.environ.get("DJANGO_ALLOWED_HOSTS", "")
-if EXTRA_ALLOWED:
-    ALLOWED_HOSTS += [h.strip() for h in EXTRA_ALLOWED.split(",") if h.strip()]
-
-# CSRF trusted origins: read from env (space- or comma-separated) + fallbacks
-_csrf_env = os.environ.get("CSRF_TRUSTED_ORIGINS", "")
-if "," in _csrf_env:
-    CSRF_TRUSTED_ORIGINS = [o.strip() for o in _csrf_env.split(",") if o.strip()]
-else:
-    CSRF_TRUSTED_ORIGINS = [o.strip() for o in _csrf_env.split() if o.strip()]
+RENDER_EXTERNAL_HOSTNAME = _get("RENDER_EXTERNAL_HOSTNAME")
+
+
+def _parse_hosts_csrf():
+    """Return (ALLOWED_HOSTS, CSRF_TRUSTED_ORIGINS) as deduplicated tuples."""
+    hosts = ["localhost", "127.0.0.1"]
+    if RENDER_EXTERNAL_HOSTNAME:
+        hosts.append(RENDER_EXTERNAL_HOSTNAME)
+
+    # Optional manual allowlist (comma-separated), e.g. DJANGO_ALLOWED_HOSTS="example.com,api.example.com"
+    hosts += [h.strip() for h in _get("DJANGO_ALLOWED_HOSTS", "").split(",") if h.strip()]
+
+    # CSRF trusted origins: read from env (space- or comma-separated) + fallbacks
+    origins = [o for o in re.split(r"[,\s]+", _get("CSRF_TRUSTED_ORIGINS", "")) if o]
 
-# If Render gives a hostname, add its https origin too
-if RENDER_EXTERNAL_HOSTNAME:
-    CSRF_TRUSTED_ORIGINS.append(f"https://{RENDER_EXTERNAL_HOSTNAME}")
+    # If Render gives a hostname, add its https origin too
+    if RENDER_EXTERNAL_HOSTNAME:
+        origins.append(f"https://{RENDER_EXTERNAL_HOSTNAME}")
 
-# (Optional) If you want to hard-allow your current URL now, keep the next line; otherwise you can remove it.
-CSRF_TRUSTED_ORIGINS.append("https://curelink3-6.onrender.com")
+    # (Optional) If you want to hard-allow your current URL now, keep the next line; otherwise you can remove it.
+    origins.append("https://curelink3-6.onrender.com")
+
+    # Drop duplicates (e.g. env + Render hostname naming the same host), keeping order
+    return tuple(dict.fromkeys(hosts)), tuple(dict.fromkeys(origins))
+
+
+ALLOWED_HOSTS, CSRF_TRUSTED_ORIGINS = _parse_hosts_csrf()
 
 # If behind a proxy/SSL terminator (Render), tell Django to trust X-Forwarded-Proto
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
@@ -69,6 +91,9 @@ INSTALLED_APPS = [
 # -------------------------------------------------------------------
 # Middleware (WhiteNoise for static files in production)
 # -------------------------------------------------------------------
+# MessageMiddleware stays: Users/Hospitals views flash messages on almost every
+# form post and the admin requires it. XFrameOptionsMiddleware stays too: no
+# proxy config in this repo (Render or nginx) sets X-Frame-Options for us.
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # serve collected static on Render
@@ -88,19 +113,24 @@ ROOT_URLCONF = "doctors_app.urls"
 WSGI_APPLICATION = "doctors_app.wsgi.application"     # still useful for management commands
 ASGI_APPLICATION = "doctors_app.asgi.application"     # Daphne will use this
 
-# Channels: start with in-memory layer so you don’t need Redis yet on Render
-CHANNEL_LAYERS = {
-    "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer"
+# Channels: Redis pub/sub layer when REDIS_URL is set (required for more than one
+# Daphne instance); otherwise fall back to in-memory for local dev.
+if _get("REDIS_URL"):
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.pubsub.RedisPubSubChannelLayer",
+            "CONFIG": {
+                "hosts": [_get("REDIS_URL")],
+                "prefix": "curelink",  # keep keys apart from other apps sharing this Redis
+            },
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels.layers.InMemoryChannelLayer"
+        }
     }
-}
-# Later, when you provision Redis on Render:
-# CHANNEL_LAYERS = {
-#     "default": {
-#         "BACKEND": "channels_redis.core.RedisChannelLayer",
-#         "CONFIG": {"hosts": [os.environ.get("REDIS_URL", "redis://localhost:6379/0")]},
-#     }
-# }
 
 # -------------------------------------------------------------------
 # Templates
@@ -108,9 +138,15 @@ CHANNEL_LAYERS = {
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [BASE_DIR / "templates"],
-        "APP_DIRS": True,
+        "DIRS": [TEMPLATES_DIR],
         "OPTIONS": {
+            # Same as Django's default for APP_DIRS=True; spelled out so the cached loader is visible
+            "loaders": [
+                ("django.template.loaders.cached.Loader", [
+                    "django.template.loaders.filesystem.Loader",
+                    "django.template.loaders.app_directories.Loader",
+                ]),
+            ],
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
@@ -128,6 +164,7 @@ DATABASES = {
     "default": dj_database_url.config(
         default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
         conn_max_age=600,
+        conn_health_checks=True,  # ping reused connections so stale sockets aren't handed to a request
         ssl_require=False,
     )
 }
@@ -155,8 +192,16 @@ USE_TZ = True
 # -------------------------------------------------------------------
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"  # collectstatic target
-STATICFILES_DIRS = [BASE_DIR / "static"] if (BASE_DIR / "static").exists() else []
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+# static/ ships with the repo, so include it without a stat() on every startup;
+# set HAS_STATIC_DIR=0 for a deployment that doesn't have it.
+STATICFILES_DIRS = [_STATIC_SRC] if _get("HAS_STATIC_DIR", "1") == "1" else []
+# Django 5.1+ only reads STORAGES (STATICFILES_STORAGE was removed).
+# With Brotli installed, WhiteNoise writes .br files next to .gz at collectstatic.
+# Manifest storage needs `collectstatic` before any DEBUG=False run (see README).
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
@@ -175,27 +220,20 @@ APPEND_SLASH = False
 # Email settings (use env variables; NEVER hardcode real creds)
 # -------------------------------------------------------------------
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
-EMAIL_HOST = os.environ.get("EMAIL_HOST", "smtp.gmail.com")
-EMAIL_USE_TLS = os.environ.get("EMAIL_USE_TLS", "True") == "True"
-EMAIL_PORT = int(os.environ.get("EMAIL_PORT", "587"))
-EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", "")
-EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", "")
+EMAIL_HOST = _get("EMAIL_HOST", "smtp.gmail.com")
+EMAIL_USE_TLS = _get("EMAIL_USE_TLS", "True") == "True"
+EMAIL_PORT = int(_get("EMAIL_PORT", "587"))
+EMAIL_HOST_USER = _get("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = _get("EMAIL_HOST_PASSWORD", "")
 
 # -------------------------------------------------------------------
 # Celery (safe defaults; won’t try localhost Redis unless REDIS_URL is set)
 # -------------------------------------------------------------------
-CELERY_BROKER_URL = os.environ.get("REDIS_URL", "")
-CELERY_RESULT_BACKEND = os.environ.get("REDIS_URL", "")
+CELERY_BROKER_URL = _get("REDIS_URL", "")
+CELERY_RESULT_BACKEND = _get("REDIS_URL", "")
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "UTC"
 
-# If you run Celery Beat separately in production, keep schedules; otherwise you can comment this out.
-from celery.schedules import crontab
-CELERY_BEAT_SCHEDULE = {
-    "send-appointment-reminders-every-1-minute": {
-        "task": "Hospitals.tasks.send_appointment_reminders",
-        "schedule": crontab(minute="*"),  # every 1 minute
-    },
-}
+# Beat schedule is set up in doctors_app/celery.py once Celery loads its config.